@@ -5,7 +5,32 @@
 from unittest import TestCase, main
 from unittest.mock import MagicMock, patch
 
-from biz.platforms.github.webhook_handler import PullRequestHandler, PushHandler
+import orjson
+
+from biz.platforms.github.webhook_handler import PullRequestHandler, PushHandler, filter_changes, _load_http_concurrency
+
+
+class TestFilterChanges(TestCase):
+    def test_filter_changes_skips_deleted_and_unsupported_files(self):
+        changes = [
+            {'new_path': 'biz/kept.py', 'diff': '@@ -1,1 +1,2 @@\n line1\n+line2', 'additions': 1},
+            {'new_path': 'biz/removed.py', 'diff': '', 'status': 'removed'},
+            {'new_path': 'biz/deleted.py', 'diff': '@@ -1,2 +0,0 @@\n-line1\n-line2\n'},
+            {'new_path': 'README.txt', 'diff': '@@ -1,1 +1,2 @@\n line1\n+line2'},
+        ]
+
+        filtered = filter_changes(changes)
+
+        self.assertEqual([item['new_path'] for item in filtered], ['biz/kept.py'])
+        self.assertEqual(filtered[0]['additions'], 1)
+        self.assertEqual(filtered[0]['deletions'], 0)
+
+
+class TestLoadHttpConcurrency(TestCase):
+    def test_invalid_values_fall_back_to_a_usable_pool_size(self):
+        for value, expected in (('', 8), ('abc', 8), ('0', 1), ('-3', 1), ('16', 16)):
+            with self.subTest(value=value), patch.dict('os.environ', {'GITHUB_HTTP_CONCURRENCY': value}):
+                self.assertEqual(_load_http_concurrency(), expected)
 
 
 class TestPushHandler(TestCase):
@@ -31,15 +56,56 @@ class TestPushHandler(TestCase):
         self.github_url = 'https://github.com'
         self.handler = PushHandler(self.sample_webhook_data, self.github_token, self.github_url)
 
-    @patch('biz.platforms.github.webhook_handler.requests.get')
+    @patch('biz.platforms.github.webhook_handler.requests.Session.get')
     def test_get_parent_commit_id(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {'parents': [{'sha': 'parent_commit_sha'}]}
+        mock_response.content = orjson.dumps([{'sha': 'sample_commit_id', 'parents': [{'sha': 'parent_commit_sha'}]}])
         mock_get.return_value = mock_response
 
         parent_id = self.handler.get_parent_commit_id('sample_commit_id')
         self.assertEqual(parent_id, 'parent_commit_sha')
+        self.assertEqual(self.handler.get_parent_commit_id('sample_commit_id'), 'parent_commit_sha')
+        mock_get.assert_called_once()
+        self.assertIn('/commits?sha=sample_commit_id&per_page=1', mock_get.call_args.args[0])
+
+    @patch('biz.platforms.github.webhook_handler.requests.Session.get')
+    def test_get_parent_commit_id_from_push_payload(self, mock_get):
+        webhook_data = dict(self.sample_webhook_data)
+        webhook_data['before'] = 'before_commit_sha'
+        webhook_data['commits'] = [{'id': 'commit_a'}, {'id': 'commit_b'}]
+        handler = PushHandler(webhook_data, self.github_token, self.github_url)
+
+        self.assertEqual(handler.get_parent_commit_id('commit_a'), 'before_commit_sha')
+        self.assertEqual(handler.get_parent_commit_id('commit_b'), 'commit_a')
+        mock_get.assert_not_called()
+
+    def _mock_commit_api(self):
+        self.handler.commit_list = [{'id': 'commit_a'}, {'id': 'commit_b'}]
+        parents = {'commit_a': 'parent_a', 'commit_b': 'commit_a'}
+        self.handler.get_parent_commit_id = MagicMock(side_effect=lambda commit_id: parents[commit_id])
+        self.handler.repository_compare = MagicMock(
+            side_effect=lambda base, head: [{'new_path': f'{base}..{head}.py'}])
+
+    def test_get_push_changes_without_before_after(self):
+        self._mock_commit_api()
+
+        changes = self.handler.get_push_changes()
+        self.assertEqual(changes, [{'new_path': 'parent_a..commit_b.py'}])
+        self.handler.repository_compare.assert_called_once_with('parent_a', 'commit_b')
+
+    @patch.dict('os.environ', {'GITHUB_PUSH_PER_COMMIT_COMPARE_ENABLED': '1'}, clear=False)
+    def test_get_push_changes_per_commit_compare(self):
+        self._mock_commit_api()
+
+        changes = self.handler.get_push_changes()
+        self.assertEqual(
+            changes,
+            [
+                {'new_path': 'parent_a..commit_a.py'},
+                {'new_path': 'commit_a..commit_b.py'},
+            ]
+        )
 
 
 class TestPullRequestHandler(TestCase):
@@ -93,6 +159,52 @@ class TestPullRequestHandler(TestCase):
             ]
         )
 
+    @patch('biz.platforms.github.webhook_handler.time.sleep')
+    @patch('biz.platforms.github.webhook_handler.requests.Session.get')
+    def test_get_pull_request_changes_retries_with_backoff(self, mock_get, mock_sleep):
+        empty_response = MagicMock()
+        empty_response.status_code = 200
+        empty_response.content = orjson.dumps([])
+        files_response = MagicMock()
+        files_response.status_code = 200
+        files_response.content = orjson.dumps([{'filename': 'biz/demo.py', 'patch': '@@ -1 +1 @@\n+line1'}])
+        mock_get.side_effect = [empty_response, empty_response, empty_response, files_response]
+
+        changes = self.handler.get_pull_request_changes()
+
+        self.assertEqual(changes[0]['new_path'], 'biz/demo.py')
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [1, 2, 4])
+
+    @patch('biz.platforms.github.webhook_handler.time.sleep')
+    @patch('biz.platforms.github.webhook_handler.requests.Session.get')
+    def test_get_pull_request_changes_stops_after_wait_budget(self, mock_get, mock_sleep):
+        empty_response = MagicMock()
+        empty_response.status_code = 200
+        empty_response.content = orjson.dumps([])
+        mock_get.return_value = empty_response
+
+        changes = self.handler.get_pull_request_changes()
+
+        self.assertEqual(changes, [])
+        self.assertEqual(mock_get.call_count, 6)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [1, 2, 4, 8, 5])
+
+    def test_extract_review_positions_with_limit(self):
+        changes = [
+            {'new_path': 'biz/demo.py', 'diff': '@@ -1,1 +1,3 @@\n line1\n+line2\n+line3'},
+            {'new_path': 'biz/demo.py', 'diff': '@@ -1,1 +1,3 @@\n line1\n+line2\n+line3'},
+            {'new_path': 'biz/other.py', 'diff': '@@ -1,1 +1,2 @@\n line1\n+line2'},
+        ]
+        self.assertEqual(
+            self.handler._extract_review_positions(changes, limit=3),
+            [
+                {'path': 'biz/demo.py', 'line': 2},
+                {'path': 'biz/demo.py', 'line': 3},
+                {'path': 'biz/other.py', 'line': 2},
+            ]
+        )
+        self.assertEqual(len(self.handler._extract_review_positions(changes, limit=1)), 1)
+
     @patch.dict('os.environ', {'GITHUB_PR_APPROVE_SCORE_THRESHOLD': '80'}, clear=False)
     def test_evaluate_approval_decision_should_approve(self):
         review_result = """### 问题描述和优化建议
@@ -129,7 +241,7 @@ class TestPullRequestHandler(TestCase):
         self.assertEqual(decision['event'], 'REQUEST_CHANGES')
         self.assertEqual(decision['score'], 0)
 
-    @patch('biz.platforms.github.webhook_handler.requests.post')
+    @patch('biz.platforms.github.webhook_handler.requests.Session.post')
     def test_add_pull_request_notes_posts_inline_comments(self, mock_post):
         mock_response = MagicMock()
         mock_response.status_code = 201
@@ -147,8 +259,8 @@ class TestPullRequestHandler(TestCase):
         self.handler.add_pull_request_notes(review_result, changes=changes)
 
         self.assertEqual(mock_post.call_count, 2)
-        first_call = mock_post.call_args_list[0]
-        second_call = mock_post.call_args_list[1]
+        # 评论并发推送，按行号排序后断言
+        first_call, second_call = sorted(mock_post.call_args_list, key=lambda c: c.kwargs['json']['line'])
 
         self.assertIn('/pulls/99/comments', first_call.args[0])
         self.assertIn('/pulls/99/comments', second_call.args[0])
@@ -159,7 +271,7 @@ class TestPullRequestHandler(TestCase):
         self.assertEqual(first_call.kwargs['json']['line'], 11)
         self.assertEqual(second_call.kwargs['json']['line'], 12)
 
-    @patch('biz.platforms.github.webhook_handler.requests.post')
+    @patch('biz.platforms.github.webhook_handler.requests.Session.post')
     def test_add_pull_request_notes_raises_when_comment_creation_fails(self, mock_post):
         mock_response = MagicMock()
         mock_response.status_code = 422
@@ -177,7 +289,19 @@ class TestPullRequestHandler(TestCase):
         with self.assertRaises(RuntimeError):
             self.handler.add_pull_request_notes(review_result, changes=changes)
 
-    @patch('biz.platforms.github.webhook_handler.requests.post')
+    @patch('biz.platforms.github.webhook_handler.requests.Session.get')
+    def test_target_branch_protected(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps([{'name': 'main'}, {'name': 'release/*'}])
+        mock_get.return_value = mock_response
+
+        self.handler.webhook_data['pull_request']['base'] = {'ref': 'release/1.0'}
+        self.assertTrue(self.handler.target_branch_protected())
+        self.handler.webhook_data['pull_request']['base'] = {'ref': 'feature/demo'}
+        self.assertFalse(self.handler.target_branch_protected())
+
+    @patch('biz.platforms.github.webhook_handler.requests.Session.post')
     def test_submit_pull_request_review_posts_correct_payload(self, mock_post):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -191,7 +315,7 @@ class TestPullRequestHandler(TestCase):
         self.assertIn('/pulls/99/reviews', call.args[0])
         self.assertEqual(call.kwargs['json']['event'], 'APPROVE')
         self.assertEqual(call.kwargs['json']['body'], 'AI Review Decision: APPROVE')
-        self.assertEqual(call.kwargs['headers']['Authorization'], 'token token')
+        self.assertEqual(self.handler._session.headers['Authorization'], 'token token')
 
 
 if __name__ == '__main__':
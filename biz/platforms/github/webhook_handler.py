@@ -1,9 +1,16 @@
+import functools
+import itertools
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 
+import orjson
 import requests
 import fnmatch
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from biz.utils.code_reviewer import CodeReviewer
 from biz.utils.log import logger
 
@@ -14,8 +21,98 @@ DEFAULT_GITHUB_PR_APPROVE_BLOCKER_KEYWORDS = [
     'critical', 'high risk', 'security', 'vulnerability', 'bug'
 ]
 DEFAULT_GITHUB_PR_REVIEW_SUMMARY_MAX_LENGTH = 1200
+DEFAULT_GITHUB_PR_REVIEW_COMMENT_MAX_COUNT = 20
+DEFAULT_GITHUB_HTTP_CONCURRENCY = 8
+MAX_GITHUB_PR_REVIEW_COMMENT_CONCURRENCY = 4
+MAX_GITHUB_RETRY_DELAY = 30
+MAX_GITHUB_PR_FILES_WAIT = 20
+
+_DIFF_DELETE_HEADER_RE = re.compile(r'@@ -\d+,\d+ \+0,0 @@')
+_HUNK_HEADER_RE = re.compile(r'@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@')
+_ORDERED_RE = re.compile(r'^\d+[\.、\)]\s*(.+)$')
+_AUTO_REVIEW_RE = re.compile(r'^\s*Auto Review Result[:：]\s*', re.IGNORECASE)
+_SCORE_RE = re.compile(r'(^|\n)\s*#{0,6}\s*(评分明细|总分)')
+_WS_RE = re.compile(r'\s+')
+_NON_DELETION_LINE_RE = re.compile(r'^[^-\n]', re.MULTILINE)
+
+
+def _load_http_concurrency() -> int:
+    try:
+        concurrency = int(os.getenv('GITHUB_HTTP_CONCURRENCY', str(DEFAULT_GITHUB_HTTP_CONCURRENCY)))
+    except ValueError:
+        concurrency = DEFAULT_GITHUB_HTTP_CONCURRENCY
+    return max(1, concurrency)
+
+
+# GitHub API 请求均为 I/O 密集型，使用有界线程池并发发起，同时限制并发数以避免触发 secondary rate limit
+_http_executor = ThreadPoolExecutor(max_workers=_load_http_concurrency())
+# 评论推送属于写操作，GitHub 对并发写更敏感，单独使用更小的线程池
+_comment_executor = ThreadPoolExecutor(max_workers=MAX_GITHUB_PR_REVIEW_COMMENT_CONCURRENCY)
+
+
+def build_session(github_token: str) -> requests.Session:
+    '''
+    创建复用连接的 GitHub API 会话，认证信息统一设置在会话的 headers 中
+    '''
+    session = requests.Session()
+    session.headers.update({
+        'Authorization': f'token {github_token}',
+        'Accept': 'application/vnd.github.v3+json'
+    })
+    # 连接池复用 TCP/TLS 连接，限流及网关类错误按 Retry-After/指数退避自动重试（默认仅重试 GET 等幂等请求）
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=1,
+            respect_retry_after_header=True,
+            status_forcelist=[429, 502, 503, 504],
+            raise_on_status=False
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=1)
+def _supported_extensions() -> tuple:
+    # 环境变量在进程启动时加载，解析结果缓存复用
+    return tuple(os.getenv('SUPPORTED_EXTENSIONS', '.java,.py,.php').split(','))
+
+
+@functools.lru_cache(maxsize=1)
+def _max_pr_comments() -> int:
+    try:
+        max_comments = int(os.environ.get('GITHUB_PR_REVIEW_COMMENT_MAX_COUNT', str(DEFAULT_GITHUB_PR_REVIEW_COMMENT_MAX_COUNT)))
+    except ValueError:
+        max_comments = DEFAULT_GITHUB_PR_REVIEW_COMMENT_MAX_COUNT
+    return max(1, max_comments)
 
 
+@functools.lru_cache(maxsize=128)
+def _compile_branch_patterns(patterns: tuple) -> re.Pattern:
+    # 将受保护分支的通配符合并为一个正则，一次匹配即可判断目标分支是否受保护
+    return re.compile('|'.join(f'(?:{fnmatch.translate(pattern)})' for pattern in patterns))
+
+
+def _is_deleted(change: dict) -> bool:
+    # 优先检查status字段是否为"removed"
+    if change.get('status') == 'removed':
+        logger.info(f"Detected file deletion via status field: {change.get('new_path')}")
+        return True
+
+    # 如果没有status字段或status不为"removed"，继续检查diff模式
+    diff = change.get('diff', '')
+    if diff and _DIFF_DELETE_HEADER_RE.match(diff):
+        # 检查除了diff头部外的所有行是否都以减号开头（或为空行），遇到第一个不符合的行即停止扫描
+        body_start = diff.find('\n') + 1  # 跳过diff头部
+        if not body_start or not _NON_DELETION_LINE_RE.search(diff, body_start):
+            logger.info(f"Detected file deletion via diff pattern: {change.get('new_path')}")
+            return True
+    return False
+
 
 def filter_changes(changes: list):
     '''
@@ -23,33 +120,10 @@ def filter_changes(changes: list):
     专门处理GitHub格式的变更
     '''
     # 从环境变量中获取支持的文件扩展名
-    supported_extensions = os.getenv('SUPPORTED_EXTENSIONS', '.java,.py,.php').split(',')
-    
-    # 筛选出未被删除的文件
-    not_deleted_changes = []
-    for change in changes:
-        # 优先检查status字段是否为"removed"
-        if change.get('status') == 'removed':
-            logger.info(f"Detected file deletion via status field: {change.get('new_path')}")
-            continue
-            
-        # 如果没有status字段或status不为"removed"，继续检查diff模式
-        diff = change.get('diff', '')
-        if diff:
-            diff_header_match = re.match(r'@@ -\d+,\d+ \+0,0 @@', diff)
-            if diff_header_match:
-                # 检查除了diff头部外的所有行是否都以减号开头
-                diff_lines = diff.split('\n')[1:]  # 跳过diff头部
-                if all(line.startswith('-') or not line for line in diff_lines):
-                    logger.info(f"Detected file deletion via diff pattern: {change.get('new_path')}")
-                    continue
-                    
-        not_deleted_changes.append(change)
-    
+    supported_extensions = _supported_extensions()
     logger.info(f"SUPPORTED_EXTENSIONS: {supported_extensions}")
-    logger.info(f"After filtering deleted files: {not_deleted_changes}")
-    
-    # 过滤 `new_path` 以支持的扩展名结尾的元素, 仅保留diff和new_path字段
+
+    # 一次遍历同时过滤已删除的文件和 `new_path` 不以支持的扩展名结尾的元素, 仅保留diff和new_path字段
     filtered_changes = [
         {
             'diff': item.get('diff', ''),
@@ -57,10 +131,10 @@ def filter_changes(changes: list):
             'additions': item.get('additions', 0),
             'deletions': item.get('deletions', 0),
         }
-        for item in not_deleted_changes
-        if any(item.get('new_path', '').endswith(ext) for ext in supported_extensions)
+        for item in changes
+        if not _is_deleted(item) and item.get('new_path', '').endswith(supported_extensions)
     ]
-    logger.info(f"After filtering by extension: {filtered_changes}")
+    logger.info(f"After filtering deleted files and by extension: {filtered_changes}")
     return filtered_changes
 
 
@@ -70,6 +144,7 @@ class PullRequestHandler:
         self.webhook_data = webhook_data
         self.github_token = github_token
         self.github_url = github_url
+        self._session = build_session(github_token)
         self.event_type = None
         self.repo_full_name = None
         self.action = None
@@ -92,46 +167,49 @@ class PullRequestHandler:
             logger.warn(f"Invalid event type: {self.event_type}. Only 'pull_request' event is supported now.")
             return []
 
-        # GitHub pull request changes API可能存在延迟，多次尝试
-        max_retries = 3  # 最大重试次数
-        retry_delay = 10  # 重试间隔时间（秒）
-        for attempt in range(max_retries):
+        # GitHub pull request changes API可能存在延迟，按 1s、2s、4s... 指数退避重试，累计等待不超过 MAX_GITHUB_PR_FILES_WAIT 秒
+        # （限流和网关错误由会话的 Retry 处理）
+        waited = 0
+        for attempt in itertools.count():
             # 调用 GitHub API 获取 Pull Request 的 files（变更）
             url = f"https://api.github.com/repos/{self.repo_full_name}/pulls/{self.pull_request_number}/files"
-            headers = {
-                'Authorization': f'token {self.github_token}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
-            response = requests.get(url, headers=headers)
-            logger.debug(
-                f"Get changes response from GitHub (attempt {attempt + 1}): {response.status_code}, {response.text}, URL: {url}")
+            response = self._session.get(url)
+            logger.debug("Get changes response from GitHub (attempt %s): %s, URL: %s", attempt + 1, response.status_code, url)
 
             # 检查请求是否成功
-            if response.status_code == 200:
-                files = response.json()
-                if files:
-                    # 转换成GitLab格式的changes
-                    changes = []
-                    for file in files:
-                        change = {
-                            'old_path': file.get('filename'),
-                            'new_path': file.get('filename'),
-                            'diff': file.get('patch', ''),
-                            'additions': file.get('additions', 0),
-                            'deletions': file.get('deletions', 0)
-                        }
-                        changes.append(change)
-                    return changes
-                else:
-                    logger.info(
-                        f"Changes is empty, retrying in {retry_delay} seconds... (attempt {attempt + 1}/{max_retries}), URL: {url}")
-                    time.sleep(retry_delay)
-            else:
+            if response.status_code != 200:
                 logger.warn(f"Failed to get changes from GitHub (URL: {url}): {response.status_code}, {response.text}")
                 return []
 
-        logger.warning(f"Max retries ({max_retries}) reached. Changes is still empty.")
-        return []  # 达到最大重试次数后返回空列表
+            files = orjson.loads(response.content)
+            if files:
+                # 转换成GitLab格式的changes
+                changes = []
+                for file in files:
+                    change = {
+                        'old_path': file.get('filename'),
+                        'new_path': file.get('filename'),
+                        'diff': file.get('patch', ''),
+                        'additions': file.get('additions', 0),
+                        'deletions': file.get('deletions', 0)
+                    }
+                    changes.append(change)
+                return changes
+
+            retry_delay = min(self._get_retry_delay(attempt), MAX_GITHUB_PR_FILES_WAIT - waited)
+            if retry_delay <= 0:
+                break
+            logger.info(f"Changes is empty, retrying in {retry_delay} seconds... (attempt {attempt + 1}), URL: {url}")
+            time.sleep(retry_delay)
+            waited += retry_delay
+
+        logger.warning(f"Changes is still empty after {attempt + 1} attempts ({waited} seconds).")
+        return []  # 达到最长等待时间后返回空列表
+
+    @staticmethod
+    def _get_retry_delay(attempt: int) -> int:
+        # 指数退避（1s、2s、4s...），单次等待不超过 MAX_GITHUB_RETRY_DELAY
+        return min(2 ** attempt, MAX_GITHUB_RETRY_DELAY)
 
     def get_pull_request_commits(self) -> list:
         # 检查是否为 Pull Request Hook 事件
@@ -140,26 +218,25 @@ class PullRequestHandler:
 
         # 调用 GitHub API 获取 Pull Request 的 commits
         url = f"https://api.github.com/repos/{self.repo_full_name}/pulls/{self.pull_request_number}/commits"
-        headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        response = requests.get(url, headers=headers)
-        logger.debug(f"Get commits response from GitHub: {response.status_code}, {response.text}")
+        response = self._session.get(url)
+        logger.debug("Get commits response from GitHub: %s, URL: %s", response.status_code, url)
         
         # 检查请求是否成功
         if response.status_code == 200:
             # 将GitHub的commits转换为GitLab格式的commits
-            github_commits = response.json()
+            github_commits = orjson.loads(response.content)
             gitlab_format_commits = []
             for commit in github_commits:
+                commit_detail = commit.get('commit') or {}
+                author = commit_detail.get('author') or {}
+                message = commit_detail.get('message') or ''
                 gitlab_commit = {
                     'id': commit.get('sha'),
-                    'title': commit.get('commit', {}).get('message', '').split('\n')[0],
-                    'message': commit.get('commit', {}).get('message', ''),
-                    'author_name': commit.get('commit', {}).get('author', {}).get('name'),
-                    'author_email': commit.get('commit', {}).get('author', {}).get('email'),
-                    'created_at': commit.get('commit', {}).get('author', {}).get('date'),
+                    'title': message.partition('\n')[0],
+                    'message': message,
+                    'author_name': author.get('name'),
+                    'author_email': author.get('email'),
+                    'created_at': author.get('date'),
                     'web_url': commit.get('html_url')
                 }
                 gitlab_format_commits.append(gitlab_commit)
@@ -174,36 +251,52 @@ class PullRequestHandler:
             return []
 
         text = review_result.strip()
-        text = re.sub(r'^\s*Auto Review Result[:：]\s*', '', text, flags=re.IGNORECASE)
+        text = _AUTO_REVIEW_RE.sub('', text)
         if not text:
             return []
 
-        # 评分区块通常不是逐条行内评论内容，优先截断掉
-        score_section_match = re.search(r'(^|\n)\s*#{0,6}\s*(评分明细|总分)', text)
-        if score_section_match:
-            text = text[:score_section_match.start()].strip()
-
-        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        # 单次遍历：同时收集列表项和按空行分隔的段落，遇到评分区块即截断（评分区块通常不是逐条行内评论内容）
         bullet_items = []
-        for line in lines:
-            bullet_match = re.match(r'^[-*+]\s+(.+)$', line)
-            ordered_match = re.match(r'^\d+[\.、\)]\s*(.+)$', line)
-            if bullet_match:
-                bullet_items.append(bullet_match.group(1).strip())
-            elif ordered_match:
-                bullet_items.append(ordered_match.group(1).strip())
+        blocks = []
+        block_lines = []
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            if not line:
+                if block_lines:
+                    blocks.append(block_lines)
+                    block_lines = []
+                continue
+
+            heading = line.lstrip('#')
+            if len(line) - len(heading) <= 6 and heading.lstrip().startswith(('评分明细', '总分')):
+                # 标题的 '#' 可能单独成行（如 "###\n评分明细"），一并截断
+                previous = block_lines or (blocks[-1] if blocks else [])
+                if heading == line and previous and len(previous[-1]) <= 6 and not previous[-1].strip('#'):
+                    previous.pop()
+                    if not previous and blocks and previous is blocks[-1]:
+                        blocks.pop()
+                break
+
+            block_lines.append(line)
+            first = line[0]
+            if first in '-*+' and line[1:2].isspace():
+                bullet_items.append(line[2:].strip())
+            elif first.isdigit():
+                ordered_match = _ORDERED_RE.match(line)
+                if ordered_match:
+                    bullet_items.append(ordered_match.group(1).strip())
+        if block_lines:
+            blocks.append(block_lines)
 
         if bullet_items:
             return bullet_items
 
         comments = []
-        for block in re.split(r'\n\s*\n', text):
-            item = block.strip()
-            if not item or item.startswith('#'):
-                continue
-            if item in ['问题描述和优化建议', '问题描述', '优化建议']:
+        for block in blocks:
+            item = '\n'.join(block)
+            if item.startswith('#') or item in ['问题描述和优化建议', '问题描述', '优化建议']:
                 continue
-            comments.append(re.sub(r'\s+', ' ', item))
+            comments.append(_WS_RE.sub(' ', item))
         return comments
 
     @staticmethod
@@ -214,37 +307,45 @@ class PullRequestHandler:
         comment_lines = []
         current_new_line = None
         for raw_line in diff.splitlines():
-            if raw_line.startswith('@@'):
-                match = re.match(r'@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@', raw_line)
+            # 按首字符分派，每行只做一次前缀判断
+            first = raw_line[:1]
+            if first == '@' and raw_line[1:2] == '@':
+                match = _HUNK_HEADER_RE.match(raw_line)
                 current_new_line = int(match.group(1)) if match else None
                 continue
 
             if current_new_line is None:
                 continue
 
-            if raw_line.startswith('+') and not raw_line.startswith('+++'):
+            if first == '+' and raw_line[:3] != '+++':
                 comment_lines.append(current_new_line)
-                current_new_line += 1
+            elif first == '-' and raw_line[:3] != '---':
                 continue
-
-            if raw_line.startswith('-') and not raw_line.startswith('---'):
-                continue
-
             current_new_line += 1
 
         return comment_lines
 
     @classmethod
-    def _extract_review_positions(cls, changes: list) -> list:
+    def _extract_review_positions(cls, changes: list, limit: int = None) -> list:
+        # limit 为需要的评论位置数量，收集足够的不重复位置后即停止解析剩余的 diff
         positions = []
+        seen = set()
         for change in changes or []:
+            if limit is not None and len(positions) >= limit:
+                break
+
             path = change.get('new_path') or change.get('filename') or change.get('old_path')
             if not path:
                 continue
 
             diff = change.get('diff') or change.get('patch') or ''
             for line in cls._extract_comment_lines_from_diff(diff):
+                if (path, line) in seen:
+                    continue
+                seen.add((path, line))
                 positions.append({'path': path, 'line': line})
+                if limit is not None and len(positions) >= limit:
+                    break
 
         return positions
 
@@ -279,7 +380,7 @@ class PullRequestHandler:
             text = ' '.join(comments).lower()
         else:
             text = (review_result or '').lower()
-            score_section_match = re.search(r'(^|\n)\s*#{0,6}\s*(评分明细|总分)', text)
+            score_section_match = _SCORE_RE.search(text)
             if score_section_match:
                 text = text[:score_section_match.start()].strip()
         blockers = []
@@ -290,7 +391,7 @@ class PullRequestHandler:
 
     @staticmethod
     def _truncate_summary(review_result: str) -> str:
-        summary = re.sub(r'\s+', ' ', (review_result or '').strip())
+        summary = _WS_RE.sub(' ', (review_result or '').strip())
         if len(summary) <= DEFAULT_GITHUB_PR_REVIEW_SUMMARY_MAX_LENGTH:
             return summary
         return summary[:DEFAULT_GITHUB_PR_REVIEW_SUMMARY_MAX_LENGTH - 3] + '...'
@@ -332,17 +433,12 @@ class PullRequestHandler:
 
     def submit_pull_request_review(self, event: str, body: str):
         url = f"https://api.github.com/repos/{self.repo_full_name}/pulls/{self.pull_request_number}/reviews"
-        headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
         data = {
             'event': event,
             'body': body,
         }
-        response = requests.post(url, headers=headers, json=data)
-        logger.debug(
-            f"Submit PR review to GitHub {url}: {response.status_code}, {response.text}, payload: {data}")
+        response = self._session.post(url, json=data)
+        logger.debug("Submit PR review to GitHub %s: %s, payload: %s", url, response.status_code, data)
         if response.status_code != 200:
             logger.error(f"Failed to submit PR review: {response.status_code}")
             logger.error(response.text)
@@ -357,14 +453,10 @@ class PullRequestHandler:
         if not comments:
             raise RuntimeError("No review comments to send for pull request.")
 
-        try:
-            max_comments = int(os.environ.get('GITHUB_PR_REVIEW_COMMENT_MAX_COUNT', '20'))
-        except ValueError:
-            max_comments = 20
-        comments = comments[:max(1, max_comments)]
+        comments = comments[:_max_pr_comments()]
 
         head_commit_id = self.webhook_data.get('pull_request', {}).get('head', {}).get('sha')
-        positions = self._extract_review_positions(changes or [])
+        positions = self._extract_review_positions(changes or [], limit=len(comments))
 
         if not head_commit_id:
             raise RuntimeError("Missing pull request head commit id for PR review comments.")
@@ -372,43 +464,48 @@ class PullRequestHandler:
             raise RuntimeError("No valid inline comment positions extracted from pull request changes.")
 
         url = f"https://api.github.com/repos/{self.repo_full_name}/pulls/{self.pull_request_number}/comments"
-        headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
 
+        payloads = []
         for index, comment in enumerate(comments):
             position = positions[index % len(positions)]
-            data = {
+            payloads.append({
                 'body': comment,
                 'commit_id': head_commit_id,
                 'path': position['path'],
                 'line': position['line'],
                 'side': 'RIGHT'
-            }
-            response = requests.post(url, headers=headers, json=data)
-            logger.debug(
-                f"Add PR review comment to GitHub {url}: {response.status_code}, {response.text}, payload: {data}")
+            })
+
+        # 各条评论互不依赖，少量并发推送以缩短总耗时
+        # 注意：并发推送时 GitHub 收到评论的先后顺序不再与评审顺序一致；文件视图中评论按所在行展示不受影响，
+        # 但会话时间线按创建时间排列。map 返回的结果仍按 payloads 顺序，失败日志与异常按评审顺序报告
+        responses = list(_comment_executor.map(lambda data: self._session.post(url, json=data), payloads))
+
+        failed = []
+        for data, response in zip(payloads, responses):
+            logger.debug("Add PR review comment to GitHub %s: %s, payload: %s", url, response.status_code, data)
             if response.status_code != 201:
                 logger.error(f"Failed to add PR review comment: {response.status_code}")
                 logger.error(response.text)
-                raise RuntimeError(
-                    f"Failed to add PR review comment, status={response.status_code}, path={position['path']}, line={position['line']}")
+                failed.append((data, response))
 
-        logger.info(f"PR review comments added: {len(comments)}/{len(comments)}")
+        logger.info(f"PR review comments added: {len(payloads) - len(failed)}/{len(payloads)}")
+        if failed:
+            data, response = failed[0]
+            raise RuntimeError(
+                f"Failed to add PR review comment, status={response.status_code}, path={data['path']}, line={data['line']}")
 
     def target_branch_protected(self) -> bool:
         url = f"https://api.github.com/repos/{self.repo_full_name}/branches?protected=true"
-        headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
 
-        response = requests.get(url, headers=headers)
+        response = self._session.get(url)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             target_branch = self.webhook_data['pull_request']['base']['ref']
-            return any(fnmatch.fnmatch(target_branch, item['name']) for item in data)
+            if not data:
+                return False
+            patterns = _compile_branch_patterns(tuple(item['name'] for item in data))
+            return bool(patterns.match(target_branch))
         else:
             logger.warn(f"Failed to get protected branches: {response.status_code}, {response.text}")
             return False
@@ -419,10 +516,13 @@ class PushHandler:
         self.webhook_data = webhook_data
         self.github_token = github_token
         self.github_url = github_url
+        self._session = build_session(github_token)
         self.event_type = None
         self.repo_full_name = None
         self.branch_name = None
         self.commit_list = []
+        self._parent_map = {}
+        self._compare_cache = {}
         self.parse_event_type()
 
     def parse_event_type(self):
@@ -435,6 +535,23 @@ class PushHandler:
         self.repo_full_name = self.webhook_data.get('repository', {}).get('full_name')
         self.branch_name = self.webhook_data.get('ref', '').replace('refs/heads/', '')
         self.commit_list = self.webhook_data.get('commits', [])
+        self._parent_map = self._build_parent_map()
+
+    def _build_parent_map(self) -> dict:
+        # Push 中的 commits 按提交顺序排列，后一个提交的父提交即为前一个提交，无需逐个调用 API 查询
+        parent_map = {
+            commit.get('id'): self.commit_list[index - 1].get('id')
+            for index, commit in enumerate(self.commit_list)
+            if index > 0 and commit.get('id') and self.commit_list[index - 1].get('id')
+        }
+
+        # 普通 Push（非创建分支、非强制推送）时，before 即为第一个提交的父提交
+        before = self.webhook_data.get('before', '')
+        first_commit_id = self.commit_list[0].get('id') if self.commit_list else None
+        if (first_commit_id and before and before.strip('0')
+                and not self.webhook_data.get('created', False) and not self.webhook_data.get('forced', False)):
+            parent_map[first_commit_id] = before
+        return parent_map
 
     def get_push_commits(self) -> list:
         # 检查是否为 Push 事件
@@ -469,15 +586,11 @@ class PushHandler:
             return
 
         url = f"https://api.github.com/repos/{self.repo_full_name}/commits/{last_commit_id}/comments"
-        headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
         data = {
             'body': message
         }
-        response = requests.post(url, headers=headers, json=data)
-        logger.debug(f"Add comment to commit {last_commit_id}: {response.status_code}, {response.text}")
+        response = self._session.post(url, json=data)
+        logger.debug("Add comment to commit %s: %s", last_commit_id, response.status_code)
         if response.status_code == 201:
             logger.info("Comment successfully added to push commit.")
         else:
@@ -487,49 +600,41 @@ class PushHandler:
     def __repository_commits(self, sha: str = "", per_page: int = 100, page: int = 1):
         # 获取仓库提交信息
         url = f"https://api.github.com/repos/{self.repo_full_name}/commits?sha={sha}&per_page={per_page}&page={page}"
-        headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        response = requests.get(url, headers=headers)
-        logger.debug(
-            f"Get commits response from GitHub for repository_commits: {response.status_code}, {response.text}, URL: {url}")
+        response = self._session.get(url)
+        logger.debug("Get commits response from GitHub for repository_commits: %s, URL: %s", response.status_code, url)
 
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         else:
             logger.warn(
                 f"Failed to get commits for sha {sha}: {response.status_code}, {response.text}")
             return []
 
     def get_parent_commit_id(self, commit_id: str) -> str:
-        url = f"https://api.github.com/repos/{self.repo_full_name}/commits/{commit_id}"
-        headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        response = requests.get(url, headers=headers)
-        logger.debug(
-            f"Get commit response from GitHub: {response.status_code}, {response.text}, URL: {url}")
-
-        if response.status_code == 200 and response.json().get('parents'):
-            return response.json().get('parents')[0].get('sha', '')
-        return ""
+        if commit_id in self._parent_map:
+            return self._parent_map[commit_id]
+
+        # 提交列表接口不返回 files/stats，从该提交开始只取一条即可拿到父提交，响应体远小于提交详情接口
+        commits = self.__repository_commits(sha=commit_id, per_page=1)
+        parents = commits[0].get('parents') if commits else None
+        parent_commit_id = parents[0].get('sha', '') if parents else ""
+        # 提交的父提交不会变化，缓存后同一事件内重复查询不再请求 API
+        if parent_commit_id:
+            self._parent_map[commit_id] = parent_commit_id
+        return parent_commit_id
 
     def repository_compare(self, base: str, head: str):
-        # 比较两个提交之间的差异
+        # 比较两个提交之间的差异，同一事件内相同的 base/head 只请求一次
+        if (base, head) in self._compare_cache:
+            return self._compare_cache[(base, head)]
+
         url = f"https://api.github.com/repos/{self.repo_full_name}/compare/{base}...{head}"
-        headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        response = requests.get(url, headers=headers)
-        logger.debug(
-            f"Get changes response from GitHub for repository_compare: {response.status_code}, {response.text}, URL: {url}")
+        response = self._session.get(url)
+        logger.debug("Get changes response from GitHub for repository_compare: %s, URL: %s", response.status_code, url)
 
         if response.status_code == 200:
             # 转换为GitLab格式的diffs
-            files = response.json().get('files', [])
+            files = orjson.loads(response.content).get('files', [])
             diffs = []
             for file in files:
                 diff = {
@@ -541,6 +646,7 @@ class PushHandler:
                     'deletions': file.get('deletions', 0),
                 }
                 diffs.append(diff)
+            self._compare_cache[(base, head)] = diffs
             return diffs
         else:
             logger.warn(
@@ -578,14 +684,26 @@ class PushHandler:
         else:
             # 如果before和after不存在，尝试通过commits获取
             logger.info("before or after not found in webhook data, trying to get changes from commits.")
-            
-            changes = []
-            for commit in self.commit_list:
-                commit_id = commit.get('id')
-                if commit_id:
-                    parent_id = self.get_parent_commit_id(commit_id)
-                    if parent_id:
-                        commit_changes = self.repository_compare(parent_id, commit_id)
-                        changes.extend(commit_changes)
-            
-            return changes 
+
+            commit_ids = [commit['id'] for commit in self.commit_list if commit.get('id')]
+            if not commit_ids:
+                return []
+            # 逐个提交compare，仅用于调试
+            if os.environ.get('GITHUB_PUSH_PER_COMMIT_COMPARE_ENABLED', '0') == '1':
+                return self.get_per_commit_changes(commit_ids)
+
+            # 一次compare获取从第一个提交的父提交到最后一个提交的全部变更，同一文件的多次修改会被合并
+            base = self.get_parent_commit_id(commit_ids[0])
+            if not base:
+                logger.info(f"Parent commit of {commit_ids[0]} not found, falling back to per-commit compare.")
+                return self.get_per_commit_changes(commit_ids)
+            return self.repository_compare(base, commit_ids[-1])
+
+    def get_per_commit_changes(self, commit_ids: list) -> list:
+        # 各提交的父提交查询与compare相互独立，并发请求以减少串行的网络往返
+        parent_ids = _http_executor.map(self.get_parent_commit_id, commit_ids)
+        pairs = [(parent_id, commit_id) for parent_id, commit_id in zip(parent_ids, commit_ids) if parent_id]
+        commit_changes = _http_executor.map(lambda pair: self.repository_compare(*pair), pairs)
+
+        return list(itertools.chain.from_iterable(commit_changes))
+
@@ -1,65 +1,147 @@
-from unittest import TestCase, main
-from unittest.mock import MagicMock, patch
-
-import biz.queue.worker as worker
+from contextlib import ExitStack, contextmanager
+from types import MappingProxyType, SimpleNamespace
+from unittest import TestCase
+from unittest.mock import DEFAULT, Mock, patch
+
+
+# 测试只读取以下数据，模块级共享，避免每个测试重复构造
+_WEBHOOK_DATA = MappingProxyType({
+    'action': 'opened',
+    'repository': {
+        'name': 'repo',
+        'full_name': 'owner/repo',
+    },
+    'pull_request': {
+        'head': {
+            'sha': 'head_commit_sha',
+            'ref': 'feature-branch',
+        },
+        'base': {
+            'ref': 'main',
+        },
+        'user': {
+            'login': 'alice',
+        },
+        'html_url': 'https://github.com/owner/repo/pull/99',
+    },
+})
+_CHANGES = (
+    {
+        'diff': '@@ -1,1 +1,2 @@\n line1\n+line2',
+        'new_path': 'biz/demo.py',
+        'additions': 1,
+        'deletions': 0,
+    },
+)
+_COMMITS = (
+    {
+        'title': 'feat: sample',
+        'message': 'feat: sample',
+    },
+)
+_APPROVAL = MappingProxyType({
+    'event': 'APPROVE',
+    'score': 82,
+    'threshold': 80,
+    'blockers': [],
+    'reason': 'Score reaches threshold and no blocker keywords were detected.',
+})
+_REVIEW_RESULT = (
+    "### 问题描述和优化建议\n"
+    "1. 建议补充单元测试。\n"
+    "\n"
+    "### 评分明细\n"
+    "总分: 82分\n"
+)
+_EXPECTED_SUBMIT = {'event': 'APPROVE', 'body': 'AI Review Decision: APPROVE'}
+
+
+class _Signal:
+    '''
+    只统计 send 调用次数的轻量 signal，替代 Mock 的调用参数记录
+    '''
+    __slots__ = ('n',)
+
+    def __init__(self):
+        self.n = 0
+
+    def send(self, *args, **kwargs):
+        self.n += 1
+
+    def reset(self):
+        self.n = 0
+
+
+# 事件分发的 signal 在各测试间复用，退出 patch 时重置计数
+_SIGNAL = _Signal()
+_EVENT_MAP = {'merge_request_reviewed': _SIGNAL}
+
+
+@contextmanager
+def _patched_worker(worker):
+    '''
+    一次性替换 worker 中 GitHub PR 流程依赖的外部对象，返回包含各 mock 的命名空间
+    '''
+    with ExitStack() as stack:
+        mocks = stack.enter_context(patch.multiple(
+            worker,
+            CodeReviewer=DEFAULT,
+            filter_github_changes=DEFAULT,
+            GithubPullRequestHandler=DEFAULT,
+        ))
+        # 只需返回 False 并记录调用次数，用普通函数替换即可，无需 Mock
+        check_calls = []
+
+        def check_mr_last_commit_id_exists(*args, **kwargs):
+            check_calls.append(args)
+            return False
+
+        stack.enter_context(
+            patch.object(worker.ReviewService, 'check_mr_last_commit_id_exists', staticmethod(check_mr_last_commit_id_exists)))
+        mocks['check_calls'] = check_calls
+        mocks['send_notification'] = stack.enter_context(patch.object(worker.notifier, 'send_notification'))
+        stack.enter_context(patch.object(worker, 'event_manager', _EVENT_MAP))
+        stack.callback(_SIGNAL.reset)
+        mocks['signal'] = _SIGNAL
+
+        def reset():
+            # patch 在整个测试类内保持生效，每个用例开始前只需清空调用记录和返回值
+            for mock in (mocks['CodeReviewer'], mocks['filter_github_changes'],
+                         mocks['GithubPullRequestHandler'], mocks['send_notification']):
+                mock.reset_mock(return_value=True, side_effect=True)
+            check_calls.clear()
+            _SIGNAL.reset()
+
+        mocks['reset'] = reset
+        yield SimpleNamespace(**mocks)
 
 
 class TestGithubPullRequestFlow(TestCase):
-    def setUp(self):
-        self.webhook_data = {
-            'action': 'opened',
-            'repository': {
-                'name': 'repo',
-                'full_name': 'owner/repo',
-            },
-            'pull_request': {
-                'head': {
-                    'sha': 'head_commit_sha',
-                    'ref': 'feature-branch',
-                },
-                'base': {
-                    'ref': 'main',
-                },
-                'user': {
-                    'login': 'alice',
-                },
-                'html_url': 'https://github.com/owner/repo/pull/99',
-            },
-        }
-        self.github_token = 'token'
-        self.github_url = 'https://github.com'
-        self.github_url_slug = 'github_com'
-        self.changes = [
-            {
-                'diff': '@@ -1,1 +1,2 @@\n line1\n+line2',
-                'new_path': 'biz/demo.py',
-                'additions': 1,
-                'deletions': 0,
-            }
-        ]
-        self.commits = [
-            {
-                'title': 'feat: sample',
-                'message': 'feat: sample',
-            }
-        ]
-        self.review_result = """### 问题描述和优化建议
-1. 建议补充单元测试。
-
-### 评分明细
-总分: 82分
-"""
-        self.approval_decision = {
-            'event': 'APPROVE',
-            'score': 82,
-            'threshold': 80,
-            'blockers': [],
-            'reason': 'Score reaches threshold and no blocker keywords were detected.',
-        }
-
-    @staticmethod
-    def _build_mock_handler(changes, commits, approval_decision):
-        handler = MagicMock()
+    @classmethod
+    def setUpClass(cls):
+        # 延迟到运行时才导入 worker，收集测试时不加载完整的 review/通知依赖链
+        import biz.queue.worker as worker
+        cls.worker = worker
+        # handler mock 的属性集合与真实类保持一致；action 是实例属性，不在类上，需要单独补充
+        cls.mock_handler = Mock(spec_set=dir(worker.GithubPullRequestHandler) + ['action'])
+        # 各用例共用同一组 patch，只在测试类开始和结束时启停一次
+        patches = ExitStack()
+        cls.addClassCleanup(patches.close)
+        cls.mocks = patches.enter_context(_patched_worker(worker))
+
+        # 测试间共享的只读数据，每个测试类只绑定一次
+        cls.webhook_data = _WEBHOOK_DATA
+        cls.github_token = 'token'
+        cls.github_url = 'https://github.com'
+        cls.github_url_slug = 'github_com'
+        cls.changes = _CHANGES
+        cls.commits = _COMMITS
+        cls.approval_decision = _APPROVAL
+
+    def _reset_mock_handler(self, changes, commits, approval_decision):
+        # 复用同一个 handler mock，重置调用记录、返回值和 side_effect 后重新设置
+        handler = self.mock_handler
+        handler.reset_mock(return_value=True, side_effect=True)
         handler.action = 'opened'
         handler.get_pull_request_changes.return_value = changes
         handler.get_pull_request_commits.return_value = commits
@@ -67,96 +149,40 @@ class TestGithubPullRequestFlow(TestCase):
         handler._build_review_body.return_value = 'AI Review Decision: APPROVE'
         return handler
 
-    @patch('biz.queue.worker.ReviewService.check_mr_last_commit_id_exists', return_value=False)
-    @patch('biz.queue.worker.CodeReviewer')
-    @patch('biz.queue.worker.filter_github_changes')
-    @patch('biz.queue.worker.GithubPullRequestHandler')
-    @patch('biz.queue.worker.notifier.send_notification')
-    def test_handle_github_pull_request_event_calls_submit_after_inline_comments(
-        self,
-        mock_notify,
-        mock_handler_cls,
-        mock_filter_changes,
-        mock_code_reviewer_cls,
-        mock_check_last_commit,
-    ):
-        handler = self._build_mock_handler(self.changes, self.commits, self.approval_decision)
-        mock_handler_cls.return_value = handler
-        mock_filter_changes.return_value = self.changes
-
-        mock_reviewer = MagicMock()
-        mock_reviewer.review_and_strip_code.return_value = self.review_result
-        mock_code_reviewer_cls.return_value = mock_reviewer
-
-        call_order = []
-
-        def add_inline_comments(*args, **kwargs):
-            call_order.append('inline')
-
-        def evaluate_decision(*args, **kwargs):
-            call_order.append('decision')
-            return self.approval_decision
-
-        def build_review_body(*args, **kwargs):
-            call_order.append('body')
-            return 'AI Review Decision: APPROVE'
-
-        def submit_review(*args, **kwargs):
-            call_order.append('submit')
-
-        handler.add_pull_request_notes.side_effect = add_inline_comments
-        handler.evaluate_approval_decision.side_effect = evaluate_decision
-        handler._build_review_body.side_effect = build_review_body
-        handler.submit_pull_request_review.side_effect = submit_review
-
-        mock_signal = MagicMock()
-        with patch('biz.queue.worker.event_manager', {'merge_request_reviewed': mock_signal}):
-            worker.handle_github_pull_request_event(
-                self.webhook_data, self.github_token, self.github_url, self.github_url_slug
-            )
-
-        self.assertEqual(call_order, ['inline', 'decision', 'body', 'submit'])
-        handler.submit_pull_request_review.assert_called_once_with(
-            event='APPROVE', body='AI Review Decision: APPROVE'
-        )
-        mock_signal.send.assert_called_once()
-        mock_notify.assert_not_called()
-        mock_check_last_commit.assert_called_once()
-
-    @patch('biz.queue.worker.ReviewService.check_mr_last_commit_id_exists', return_value=False)
-    @patch('biz.queue.worker.CodeReviewer')
-    @patch('biz.queue.worker.filter_github_changes')
-    @patch('biz.queue.worker.GithubPullRequestHandler')
-    @patch('biz.queue.worker.notifier.send_notification')
-    def test_handle_github_pull_request_event_notifies_when_submit_review_failed(
-        self,
-        mock_notify,
-        mock_handler_cls,
-        mock_filter_changes,
-        mock_code_reviewer_cls,
-        mock_check_last_commit,
-    ):
-        handler = self._build_mock_handler(self.changes, self.commits, self.approval_decision)
-        handler.submit_pull_request_review.side_effect = RuntimeError('submit failed')
-        mock_handler_cls.return_value = handler
-        mock_filter_changes.return_value = self.changes
-
-        mock_reviewer = MagicMock()
-        mock_reviewer.review_and_strip_code.return_value = self.review_result
-        mock_code_reviewer_cls.return_value = mock_reviewer
-
-        mock_signal = MagicMock()
-        with patch('biz.queue.worker.event_manager', {'merge_request_reviewed': mock_signal}):
-            worker.handle_github_pull_request_event(
-                self.webhook_data, self.github_token, self.github_url, self.github_url_slug
-            )
-
-        handler.add_pull_request_notes.assert_called_once()
-        handler.submit_pull_request_review.assert_called_once()
-        mock_signal.send.assert_not_called()
-        mock_notify.assert_called_once()
-        mock_check_last_commit.assert_called_once()
-
-
-if __name__ == '__main__':
-    main()
+    def test_handle_github_pull_request_event_submits_review_after_inline_comments(self):
+        scenarios = [
+            # (submit_effect, notify_called, signal_called, expected_call_order)
+            (None, False, True, ['inline', 'decision', 'body', 'submit']),
+            (RuntimeError('submit failed'), True, False, None),
+        ]
+        for submit_effect, notify_called, signal_called, expected_call_order in scenarios:
+            with self.subTest(submit_effect=submit_effect):
+                mocks = self.mocks
+                mocks.reset()
+                handler = self._reset_mock_handler(self.changes, self.commits, self.approval_decision)
+                mocks.GithubPullRequestHandler.return_value = handler
+                mocks.filter_github_changes.return_value = self.changes
+
+                mock_reviewer = Mock()
+                mock_reviewer.review_and_strip_code.return_value = _REVIEW_RESULT
+                mocks.CodeReviewer.return_value = mock_reviewer
+
+                handler.submit_pull_request_review.side_effect = submit_effect
+                # 挂到同一个父 mock 上，通过 mock_calls 记录调用顺序
+                parent = Mock()
+                parent.attach_mock(handler.add_pull_request_notes, 'inline')
+                parent.attach_mock(handler.evaluate_approval_decision, 'decision')
+                parent.attach_mock(handler._build_review_body, 'body')
+                parent.attach_mock(handler.submit_pull_request_review, 'submit')
+
+                self.worker.handle_github_pull_request_event(
+                    self.webhook_data, self.github_token, self.github_url, self.github_url_slug
+                )
+
+                if expected_call_order:
+                    self.assertEqual([mock_call[0] for mock_call in parent.mock_calls], expected_call_order)
+                handler.add_pull_request_notes.assert_called_once()
+                handler.submit_pull_request_review.assert_called_once_with(**_EXPECTED_SUBMIT)
+                self.assertEqual(mocks.signal.n, 1 if signal_called else 0)
+                self.assertEqual(mocks.send_notification.call_count, 1 if notify_called else 0)
+                self.assertEqual(len(mocks.check_calls), 1)